@@ -82,6 +82,12 @@ setup(
         'nose',
     ],
     extras_require={
+        'numba': [
+            'numba',
+        ],
+        'orjson': [
+            'orjson',
+        ],
         'dev': [
             'isort',
             'pylint',
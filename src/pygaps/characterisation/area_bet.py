@@ -1,15 +1,19 @@
 """This module contains BET area calculations."""
 
+import math
 import warnings
 
+import numpy
 import scipy.constants as const
-import scipy.stats
 
 from ..core.adsorbate import Adsorbate
 from ..graphing.calcgraph import bet_plot
 from ..graphing.calcgraph import roq_plot
 from ..utilities.exceptions import CalculationError
 from ..utilities.exceptions import ParameterError
+from ..utilities.numba_utilities import numba_jit
+
+_AVOGADRO = const.Avogadro
 
 
 def area_BET(isotherm, limits=None, verbose=False):
@@ -182,7 +186,7 @@ def area_BET_raw(pressure, loading, cross_section, limits=None):
     Parameters
     ----------
     pressure : array
-        Pressures, relative.
+        Pressures, relative, in ascending order.
     loading : array
         Loadings, in mol/basis.
     cross_section : float
@@ -216,51 +220,33 @@ def area_BET_raw(pressure, loading, cross_section, limits=None):
         raise ParameterError("The length of the pressure and loading arrays"
                              " do not match")
 
+    # Work on contiguous float arrays from here on
+    pressure = numpy.ascontiguousarray(pressure, dtype='float64')
+    loading = numpy.ascontiguousarray(loading, dtype='float64')
+
     # Generate the Rouquerol array
-    roq_t_array = roq_transform(pressure, loading)
+    roq_t_array = loading * (1.0 - pressure)
 
     # select the maximum and minimum of the points and the pressure associated
     if limits is None:
-        maximum = len(roq_t_array) - 1
-        for index, value in enumerate(roq_t_array):
-            if index == maximum:
-                break
-            if value > roq_t_array[index + 1]:
-                maximum = index
-                break
-        min_p = pressure[maximum] / 10
-
-        minimum = len(roq_t_array) - 1
-        for index, value in enumerate(pressure):
-            if index == minimum:
-                break
-            if value > min_p:
-                minimum = index
-                break
+        minimum, maximum = _find_window_auto(pressure, roq_t_array)
     else:
-        maximum = len(roq_t_array) - 1
-        if limits[1]:
-            for index, value in reversed(list(enumerate(pressure))):
-                if value < limits[1]:
-                    maximum = index
-                    break
-
-        minimum = 0
-        if limits[0]:
-            for index, value in enumerate(pressure):
-                if value > limits[0]:
-                    minimum = index
-                    break
+        minimum, maximum = _find_window_manual(pressure, limits)
 
     if maximum - minimum < 3:
         raise CalculationError("The isotherm does not have enough points in the BET "
                                "region. Unable to calculate BET area.")
 
     # calculate the BET transform, slope and intercept
-    bet_t_array = bet_transform(
-        pressure[minimum:maximum], loading[minimum:maximum])
-    slope, intercept, corr_coef = bet_optimisation(
-        pressure[minimum:maximum], bet_t_array)
+    # in a single compiled pass if possible
+    kernel = numba_jit(_bet_window_fit, cache=True, error_model='numpy')
+    if kernel is not None:
+        slope, intercept, corr_coef = kernel(pressure, loading, minimum, maximum)
+    else:
+        # the Rouquerol array is reused to avoid recomputing it on the slice
+        bet_t_array = pressure[minimum:maximum] / roq_t_array[minimum:maximum]
+        slope, intercept, corr_coef = bet_optimisation(
+            pressure[minimum:maximum], bet_t_array)
 
     # calculate the BET parameters
     n_monolayer, p_monolayer, c_const, bet_area = bet_parameters(
@@ -290,16 +276,106 @@ def bet_transform(pressure, loading):
 
 def bet_optimisation(pressure, bet_points):
     """Finds the slope and intercept of the BET region."""
-    slope, intercept, corr_coef, p, stderr = scipy.stats.linregress(
-        pressure, bet_points)
+    x = numpy.asarray(pressure, dtype='float64')
+    y = numpy.asarray(bet_points, dtype='float64')
+
+    # least squares line from the sums of a single pass over the data
+    n = x.size
+    s_x = x.sum()
+    s_y = y.sum()
+    s_xx = numpy.dot(x, x)
+    s_xy = numpy.dot(x, y)
+    s_yy = numpy.dot(y, y)
+
+    cov_xy = n * s_xy - s_x * s_y
+    var_x = n * s_xx - s_x * s_x
+    var_y = n * s_yy - s_y * s_y
+
+    slope = cov_xy / var_x
+    intercept = (s_y - slope * s_x) / n
+    corr_coef = cov_xy / math.sqrt(var_x * var_y)
+
+    return slope, intercept, corr_coef
+
+
+def _find_window_auto(pressure, roq_t_array):
+    """Find the BET region from the Rouquerol criteria."""
+    last = len(roq_t_array) - 1
+
+    # the maximum is the last point before the Rouquerol plot decreases
+    decreasing = numpy.flatnonzero(numpy.diff(roq_t_array) < 0)
+    if decreasing.size:
+        maximum = int(decreasing[0])
+    else:
+        maximum = last
+    min_p = pressure[maximum] / 10
+
+    # the minimum is the first point above a tenth of the maximum pressure
+    minimum = min(int(numpy.searchsorted(pressure, min_p, side='right')), last)
+
+    return minimum, maximum
+
+
+def _find_window_manual(pressure, limits):
+    """Find the BET region from user-specified pressure limits."""
+    maximum = len(pressure) - 1
+    if limits[1]:
+        # last point strictly below the upper limit
+        index = int(numpy.searchsorted(pressure, limits[1], side='left')) - 1
+        if index >= 0:
+            maximum = index
+
+    minimum = 0
+    if limits[0]:
+        # first point strictly above the lower limit
+        index = int(numpy.searchsorted(pressure, limits[0], side='right'))
+        if index < len(pressure):
+            minimum = index
+
+    return minimum, maximum
+
+
+def _bet_window_fit(pressure, loading, minimum, maximum):
+    """
+    Fit the BET region between two indices, meant to be compiled.
+
+    Fuses the BET transform with the sums of the linear fit,
+    without creating any intermediate arrays.
+    """
+    n = maximum - minimum
+    s_x = 0.0
+    s_y = 0.0
+    s_xx = 0.0
+    s_xy = 0.0
+    s_yy = 0.0
+    for i in range(minimum, maximum):
+        x = pressure[i]
+        y = x / (loading[i] * (1.0 - x))
+        s_x += x
+        s_y += y
+        s_xx += x * x
+        s_xy += x * y
+        s_yy += y * y
+
+    cov_xy = n * s_xy - s_x * s_y
+    var_x = n * s_xx - s_x * s_x
+    var_y = n * s_yy - s_y * s_y
+
+    slope = cov_xy / var_x
+    intercept = (s_y - slope * s_x) / n
+    corr_coef = cov_xy / math.sqrt(var_x * var_y)
+
     return slope, intercept, corr_coef
 
 
 def bet_parameters(slope, intercept, cross_section):
     """Calculates the BET parameters from the slope and intercept."""
 
-    c_const = (slope / intercept) + 1
-    n_monolayer = 1 / (intercept * c_const)
-    p_monolayer = 1 / (scipy.sqrt(c_const) + 1)
-    bet_area = n_monolayer * cross_section * (10**(-18)) * const.Avogadro
+    c_const = (slope / intercept) + 1.0
+    n_monolayer = 1.0 / (intercept * c_const)
+    if c_const >= 0:
+        p_monolayer = 1.0 / (math.sqrt(c_const) + 1.0)
+    else:
+        p_monolayer = math.nan
+    bet_area = n_monolayer * cross_section * 1e-18 * _AVOGADRO
     return n_monolayer, p_monolayer, c_const, bet_area
@@ -132,7 +132,8 @@ def initial_henry_virial(isotherm, optimization_params=None, verbose=False):
     verbose : bool, optional
         Whether to print out extra information.
     optimization_params : dict
-        Custom parameters to pass to SciPy.optimize.least_squares.
+        Custom parameters for the virial fit. Only ``add_point`` is used,
+        see :meth:`pygaps.modelling.virial.Virial.fit`.
 
     Returns
     -------
@@ -8,7 +8,8 @@ import os
 
 import numpy
 import pandas
-import scipy
+import scipy.interpolate
+import scipy.optimize
 
 from ..core.adsorbate import Adsorbate
 from ..graphing.calcgraph import psd_plot
@@ -229,8 +230,10 @@ def psd_dft_kernel_fit(pressure, loading, kernel_path, bspline_order=2):
 
         f(x) = \sum_{p=p_0}^{p=p_x} (n_{p,exp} - \sum_{w=w_0}^{w=w_y} n_{p, kernel} X_w )^2
 
-    The function is then minimised using the `scipy.optimise.minimise` module, with the
-    constraint that the contribution of each kernel isotherm cannot be negative.
+    As the loading is linear in the contributions, this is a linear least squares
+    problem, which is solved using the bounded-variable least squares algorithm in
+    `scipy.optimize.lsq_linear`, with the constraint that the contribution of
+    each kernel isotherm cannot be negative.
 
     """
     # Parameter checks
@@ -243,37 +246,17 @@ def psd_dft_kernel_fit(pressure, loading, kernel_path, bspline_order=2):
 
     # generate the numpy arrays
     try:
-        kernel_points = numpy.asarray([kernel[size](pressure) for size in kernel])
+        kernel_points = kernel['interpolator'](pressure)
     except ValueError:
         raise CalculationError(
             "Could not get kernel values at isotherm points. "
             "Does your kernel pressure range apply to this isotherm?"
         )
-    pore_widths = numpy.asarray(list(kernel.keys()), dtype='float64')
-
-    # define the minimization function
-    def kernel_loading(pore_dist):
-        return numpy.multiply(
-            kernel_points, pore_dist[:, numpy.newaxis]      # -> multiply each loading with its contribution
-        ).sum(axis=0)                                       # -> add the contributions together at each pressure
-
-    def sum_squares(pore_dist):
-        return numpy.square(                                                  # -> square the difference
-            numpy.subtract(                                                   # -> between calculated and isotherm
-                kernel_loading(pore_dist), loading)).sum(axis=0)              # -> then sum the squares together
-
-    # define the constraints (x>0)
-    cons = [{
-        'type': 'ineq',
-        'fun': lambda x: x,
-    }]
-
-    # # run the optimisation algorithm
-    guess = numpy.array([0 for pore in pore_widths])
-    bounds = [(0, None) for pore in pore_widths]
-    result = scipy.optimize.minimize(
-        sum_squares, guess, method='SLSQP',
-        bounds=bounds, constraints=cons, options={'ftol': 1e-04})
+    pore_widths = kernel['pore_widths']
+
+    # run the non-negative least squares fit
+    result = scipy.optimize.lsq_linear(
+        kernel_points.T, loading, bounds=(0, numpy.inf), method='bvls')
 
     if not result.success:
         raise CalculationError(
@@ -281,7 +264,7 @@ def psd_dft_kernel_fit(pressure, loading, kernel_path, bspline_order=2):
         )
 
     # convert from preponderance to distribution
-    final_loading = kernel_loading(result.x)
+    final_loading = numpy.dot(result.x, kernel_points)
     pore_dist = result.x / numpy.ediff1d(pore_widths, to_begin=pore_widths[0])
     pore_widths, pore_dist = bspline(pore_widths, pore_dist, degree=bspline_order)
 
@@ -293,9 +276,9 @@ def _load_kernel(path):
     Load a kernel from disk or from memory.
 
     Essentially takes a kernel stored as a pressure-loading
-    table, creates an interpolator for each
-    isotherm, then stores them as a dictionary of
-    pore-size keys to interpolator values.
+    table and converts it to contiguous arrays of pore widths,
+    pressures and loadings (one row for each pore width). A single
+    interpolator is then created over all the kernel isotherms.
 
     Parameters
     ----------
@@ -305,25 +288,30 @@ def _load_kernel(path):
     Returns
     -------
     dict
-        The kernel with its pore size components as keys.
+        The kernel, with its ``pore_widths``, ``pressure`` and
+        ``loading`` arrays and the ``interpolator`` of the loading.
     """
     if path in _LOADED:
         return _LOADED[path]
 
     raw_kernel = pandas.read_csv(path, index_col=0)
 
-    # add a 0 in the dataframe for interpolation between lowest values
-    raw_kernel = raw_kernel.append(pandas.DataFrame(
-        [0 for col in raw_kernel.columns], index=raw_kernel.columns, columns=[0]).transpose())
+    pore_widths = numpy.asarray(raw_kernel.columns, dtype='float64')
 
-    kernel = {}
-    for pore_size in raw_kernel:
-        interpolator = scipy.interpolate.interp1d(
-            raw_kernel[pore_size].index,
-            raw_kernel[pore_size].values,
-            kind='cubic')
+    # add a 0 in the arrays for interpolation between lowest values
+    pressure = numpy.empty(len(raw_kernel.index) + 1)
+    pressure[0] = 0
+    pressure[1:] = raw_kernel.index
+    loading = numpy.zeros((len(pore_widths), len(pressure)))
+    loading[:, 1:] = raw_kernel.values.T
 
-        kernel.update({pore_size: interpolator})
+    kernel = {
+        'pore_widths': pore_widths,
+        'pressure': pressure,
+        'loading': loading,
+        'interpolator': scipy.interpolate.interp1d(
+            pressure, loading, kind='cubic', axis=1),
+    }
 
     # Save the kernel in memory
     _LOADED[path] = kernel
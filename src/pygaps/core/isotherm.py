@@ -69,6 +69,7 @@ class Isotherm():
         'temperature',
         'adsorbate'
     ]
+    _required_keys = frozenset(_required_params)
     _named_params = {
         'iso_type': str,
         'material_batch': str,
@@ -98,10 +99,11 @@ class Isotherm():
 
         """
         # Checks
-        if any(k not in properties
-               for k in self._required_params):
+        missing = self._required_keys.difference(properties)
+        if missing:
             raise ParameterError(
-                "Isotherm MUST have the following properties:{0}".format(self._required_params))
+                "Isotherm MUST have the following properties:{0}. "
+                "Missing: {1}".format(self._required_params, sorted(missing)))
 
         # We create a custom warning format that only displays the message.
         def custom_formatwarning(msg, *args, **kwargs):
@@ -111,22 +113,24 @@ class Isotherm():
         old_formatter = warnings.formatwarning
         warnings.formatwarning = custom_formatwarning
 
-        for k in self._unit_params:
+        # Take out all units and modes in a single pass, assuming defaults
+        units = {}
+        for k, default in self._unit_params.items():
             if k not in properties:
                 warnings.warn(
                     "WARNING: '{0}' was not specified".format(k) +
-                    ", assumed as '{0}'".format(self._unit_params[k])
+                    ", assumed as '{0}'".format(default)
                 )
-                properties[k] = self._unit_params[k]
+            units[k] = properties.pop(k, default)
 
         warnings.formatwarning = old_formatter
 
-        pressure_unit = properties.pop('pressure_unit')
-        pressure_mode = properties.pop('pressure_mode')
-        adsorbent_unit = properties.pop('adsorbent_unit')
-        adsorbent_basis = properties.pop('adsorbent_basis')
-        loading_unit = properties.pop('loading_unit')
-        loading_basis = properties.pop('loading_basis')
+        pressure_unit = units['pressure_unit']
+        pressure_mode = units['pressure_mode']
+        adsorbent_unit = units['adsorbent_unit']
+        adsorbent_basis = units['adsorbent_basis']
+        loading_unit = units['loading_unit']
+        loading_basis = units['loading_basis']
 
         if adsorbent_basis is None or adsorbent_basis not in _MATERIAL_MODE:
             raise ParameterError(
@@ -53,15 +53,17 @@ class Henry(IsothermBaseModel):
 
         Parameters
         ----------
-        pressure : float
+        pressure : float or array
             The pressure at which to calculate the loading.
 
         Returns
         -------
-        float
+        float or array
             Loading at specified pressure.
         """
-        return self.params["K"] * pressure
+        if numpy.isscalar(pressure):
+            return self.params["K"] * pressure
+        return self.params["K"] * numpy.asarray(pressure)
 
     def pressure(self, loading):
         """
@@ -76,15 +78,17 @@ class Henry(IsothermBaseModel):
 
         Parameters
         ----------
-        loading : float
+        loading : float or array
             The loading at which to calculate the pressure.
 
         Returns
         -------
-        float
+        float or array
             Pressure at specified loading.
         """
-        return loading / self.params["K"]
+        if numpy.isscalar(loading):
+            return loading / self.params["K"]
+        return numpy.asarray(loading) / self.params["K"]
 
     def spreading_pressure(self, pressure):
         r"""
@@ -105,15 +109,17 @@ class Henry(IsothermBaseModel):
 
         Parameters
         ----------
-        pressure : float
+        pressure : float or array
             The pressure at which to calculate the spreading pressure.
 
         Returns
         -------
-        float
+        float or array
             Spreading pressure at specified pressure.
         """
-        return self.params["K"] * pressure
+        if numpy.isscalar(pressure):
+            return self.params["K"] * pressure
+        return self.params["K"] * numpy.asarray(pressure)
 
     def initial_guess(self, pressure, loading):
         """
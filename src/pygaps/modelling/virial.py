@@ -1,14 +1,18 @@
 """Virial isotherm model."""
 
+import collections
+import math
 import warnings
 
 import matplotlib.pyplot as plt
 import numpy
-import scipy.optimize as opt
 
 from ..utilities.exceptions import CalculationError
+from ..utilities.numba_utilities import numba_jit
 from .base_model import IsothermBaseModel
 
+_FIT_CACHE_SIZE = 8  # Number of loading arrays kept between virial fits
+
 
 class Virial(IsothermBaseModel):
     r"""
@@ -52,6 +56,15 @@ class Virial(IsothermBaseModel):
         "C": [-numpy.inf, numpy.inf],
     }
 
+    def __init__(self):
+        """Instantiate parameters and the fitting cache."""
+        super().__init__()
+        self._fit_cache = collections.OrderedDict()
+
+    def clear_cache(self):
+        """Clear the loading terms cached between fits."""
+        self._fit_cache.clear()
+
     def loading(self, pressure):
         """
         Calculate loading at specified pressure.
@@ -62,25 +75,30 @@ class Virial(IsothermBaseModel):
 
         Parameters
         ----------
-        pressure : float
+        pressure : float or array
             The pressure at which to calculate the loading.
 
         Returns
         -------
-        float
+        float or array
             Loading at specified pressure.
         """
-        def fun(x):
-            return (self.pressure(x) - pressure)**2
-
-        opt_res = opt.minimize(fun, pressure, method='Nelder-Mead')
-
-        if not opt_res.success:
-            raise CalculationError("""
-            Root finding for failed. Error: \n\t{}
-            """.format(opt_res.message))
-
-        return opt_res.x
+        # Find the smallest root in ln(n) of the residual
+        # f = ln(n) - ln(K) + An + Bn^2 + Cn^3 - ln(p)
+        # which has a closed form derivative with respect to ln(n)
+        pressure_arr = numpy.atleast_1d(numpy.asarray(pressure, dtype='float64'))
+        loading = numpy.zeros_like(pressure_arr)
+
+        positive = pressure_arr > 0
+        if positive.any():
+            loading[positive] = _virial_inverse(
+                pressure_arr[positive],
+                self.params['K'], self.params['A'],
+                self.params['B'], self.params['C'])
+
+        if numpy.ndim(pressure) == 0:
+            return loading[0]
+        return loading
 
     def pressure(self, loading):
         """
@@ -158,8 +176,10 @@ class Virial(IsothermBaseModel):
 
     def fit(self, pressure, loading, param_guess, optimization_params=None, verbose=False):
         """
-        Fit model to data using nonlinear optimization with least squares loss function.
+        Fit model to data using a linear least squares fit of ln(p/n).
 
+        Since the virial model is a polynomial in loading once expressed as
+        ln(p/n), the fit is solved directly through its normal equations.
         Resulting parameters are assigned to self.
 
         Parameters
@@ -168,20 +188,17 @@ class Virial(IsothermBaseModel):
             The pressures of each point.
         loading : ndarray
             The loading for each point.
+        param_guess : dict
+            Unused, kept for compatibility with the other models.
         optimization_params : dict
-            Custom parameters to pass to SciPy.optimize.least_squares.
+            Only the ``add_point`` option is taken into account,
+            any other options are ignored with a warning.
         verbose : bool, optional
             Prints out extra information about steps taken.
         """
         if verbose:
             print("Attempting to model using {}".format(self.name))
 
-        # parameter names (cannot rely on order in Dict)
-        param_names = [param for param in self.params]
-        guess = numpy.array([param_guess[param] for param in param_names])
-        bounds = [[self.param_bounds[param][0] for param in param_names],
-                  [self.param_bounds[param][1] for param in param_names]]
-
         # remove invalid values in function
         zero_values = ~numpy.logical_and(pressure > 0, loading > 0)
         if any(zero_values):
@@ -190,13 +207,17 @@ class Virial(IsothermBaseModel):
             loading = loading[~zero_values]
 
         # define fitting function as polynomial transformed input
-        ln_p_over_n = numpy.log(numpy.divide(pressure, loading))
+        ln_p_over_n = numpy.log(pressure) - numpy.log(loading)
 
         # add point
         add_point = False
         added_point = False
         if optimization_params:
             add_point = optimization_params.pop('add_point', None)
+            if optimization_params:
+                warnings.warn(
+                    "The virial model is fitted directly, ignoring optimization "
+                    "parameters: {0}".format(sorted(optimization_params)))
         fractional_loading = loading / max(loading)
         if len(fractional_loading[fractional_loading < 0.5]) < 3:
             if not add_point:
@@ -216,40 +237,30 @@ class Virial(IsothermBaseModel):
             ln_p_over_n = numpy.hstack([ln_p_over_n[0], ln_p_over_n])
             loading = numpy.hstack([1e-1, loading])
 
-        def fit_func(x, l, ln_p_over_n):
-            for i, _ in enumerate(param_names):
-                self.params[param_names[i]] = x[i]
-            return self.params['C'] * l**3 + self.params['B'] * l**2 \
-                + self.params['A'] * l - numpy.log(self.params['K']) - ln_p_over_n
-
-        kwargs = dict(
-            bounds=bounds,                      # supply the bounds of the parameters
-            # loss='huber',                     # use a loss function against outliers
-            # f_scale=0.1,                      # scale of outliers
-        )
-        if optimization_params:
-            kwargs.update(optimization_params)
-
-        # minimize RSS
-        opt_res = opt.least_squares(
-            fit_func, guess,                    # provide the fit function and initial guess
-            args=(loading, ln_p_over_n),        # supply the extra arguments to the fit function
-            **kwargs
-        )
-        if not opt_res.success:
+        # the cubic is only determined by at least four distinct loadings
+        distinct = numpy.unique(loading).size
+        if distinct < 4:
             raise CalculationError(
-                "\n\tMinimization of RSS for {0} isotherm fitting failed with error:"
-                "\n\t\t{1}"
-                "\n\tTry a different starting point in the nonlinear optimization"
-                "\n\tby passing a dictionary of parameter guesses, param_guess, to the constructor."
-                "\n\tDefault starting guess for parameters:"
-                "\n\t{2}".format(self.name, opt_res.message, param_guess))
+                "\n\tFitting of the {0} isotherm requires at least four points with "
+                "distinct loadings, the isotherm has {1}.".format(self.name, distinct))
+
+        # build the normal equations of the cubic fit from the moments
+        # of the loading, sum(n^k) for k=0..6, and sum(n^k * ln(p/n)) for k=0..3
+        # the loading terms are reused when refitting on the same loading
+        x = loading
+        y = ln_p_over_n
+        x2, x3, moments_inv = self._loading_moments(x)
+        t_k = numpy.array([y.sum(), (x * y).sum(), (x2 * y).sum(), (x3 * y).sum()])
+        coeffs = moments_inv @ t_k
 
         # assign params
-        for index, _ in enumerate(param_names):
-            self.params[param_names[index]] = opt_res.x[index]
+        self.params['K'] = numpy.exp(-coeffs[0])
+        self.params['A'] = coeffs[1]
+        self.params['B'] = coeffs[2]
+        self.params['C'] = coeffs[3]
 
-        self.rmse = numpy.sqrt(numpy.sum((opt_res.fun)**2) / len(loading))
+        residuals = coeffs[0] + coeffs[1] * x + coeffs[2] * x2 + coeffs[3] * x3 - y
+        self.rmse = numpy.sqrt(numpy.sum(residuals**2) / len(loading))
 
         if verbose:
             print("Model {0} success, rmse is {1}".format(
@@ -257,9 +268,218 @@ class Virial(IsothermBaseModel):
             n_load = numpy.linspace(1e-2, numpy.amax(loading), 100)
             fig, ax = plt.subplots()
             ax.plot(loading, ln_p_over_n, '.')
-            ax.plot(n_load, numpy.log(numpy.divide(self.pressure(n_load), n_load)), '-')
+            ax.plot(n_load, numpy.log(self.pressure(n_load)) - numpy.log(n_load), '-')
             if added_point:
                 ax.plot(1e-1, ln_p_over_n[0], '.r')
             ax.set_title("Virial fit")
             ax.set_xlabel("Loading")
             ax.set_ylabel("ln(p/n)")
+
+    def _loading_moments(self, loading):
+        """
+        Return the powers of the loading and the inverse moment matrix.
+
+        Results are cached on the loading values, keeping
+        the last few loading arrays which were fitted.
+        """
+        key = (loading.dtype.str, loading.tobytes())
+        cached = self._fit_cache.get(key)
+        if cached is not None:
+            self._fit_cache.move_to_end(key)
+            return cached
+
+        x2 = loading * loading
+        x3 = x2 * loading
+        s_k = [loading.size, loading.sum(), x2.sum(), x3.sum(),
+               (x2 * x2).sum(), (x3 * x2).sum(), (x3 * x3).sum()]
+        moments = numpy.array([s_k[i:i + 4] for i in range(4)])
+
+        try:
+            moments_inv = numpy.linalg.inv(moments)
+        except numpy.linalg.LinAlgError as err:
+            raise CalculationError(
+                "\n\tFitting of the {0} isotherm failed with error:"
+                "\n\t\t{1}"
+                "\n\tThe isotherm may not have enough distinct points.".format(self.name, err))
+
+        cached = (x2, x3, moments_inv)
+        self._fit_cache[key] = cached
+        if len(self._fit_cache) > _FIT_CACHE_SIZE:
+            self._fit_cache.popitem(last=False)
+
+        return cached
+
+
+def _virial_segments(A, B, C):
+    """
+    Find the loading intervals on which the virial pressure increases.
+
+    The derivative of ln(p) with respect to ln(n) is the cubic
+    1 + An + 2Bn^2 + 3Cn^3, so the pressure can only turn over
+    at its positive real roots. Returns the start and end of each
+    interval where the cubic is positive, the last end being infinite.
+    """
+    coeffs = numpy.trim_zeros(numpy.array([3 * C, 2 * B, A, 1.0]), 'f')
+    roots = numpy.roots(coeffs)
+    real = numpy.abs(roots.imag) <= 1e-9 * numpy.maximum(1, numpy.abs(roots))
+    roots = numpy.sort(roots.real[real & (roots.real > 0)])
+
+    bounds = numpy.concatenate(([0.0], roots, [numpy.inf]))
+    middle = numpy.append((bounds[:-2] + bounds[1:-1]) / 2, 2 * bounds[-2] + 1)
+    increasing = 1 + middle * (A + middle * (2 * B + middle * 3 * C)) > 0
+
+    return bounds[:-1][increasing], bounds[1:][increasing]
+
+
+def _virial_inverse(pressure, K, A, B, C, tol=1e-10, maxiter=100):
+    """
+    Invert the virial equation for an array of positive pressures.
+
+    The loading returned is the smallest root of p(n) = p, which
+    lies on the first interval of increasing pressure that reaches p.
+    On that interval the root is bracketed, and found through Newton
+    iterations on the logarithm of the loading, falling back to
+    bisection whenever a step leaves the bracket.
+    If numba is available, a compiled point-by-point kernel is used instead.
+    """
+    seg_lo, seg_hi = _virial_segments(A, B, C)
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        ln_k = numpy.log(K)
+
+    kernel = numba_jit(_virial_inverse_kernel, cache=True, error_model='numpy')
+    if kernel is not None:
+        loading, converged = kernel(
+            numpy.log(numpy.ascontiguousarray(pressure, dtype='float64')),
+            float(ln_k), float(A), float(B), float(C),
+            seg_lo, seg_hi, tol, maxiter)
+        if not converged:
+            raise CalculationError(
+                "Root finding for the virial loading failed, the pressure "
+                "may be outside the range the model can reach.")
+        return loading
+
+    ln_p = numpy.log(pressure)
+
+    def residual(ln_n):
+        n = numpy.exp(ln_n)
+        return ln_n - ln_k + n * (A + n * (B + n * C)) - ln_p
+
+    # select the first increasing interval which reaches each pressure
+    lo = numpy.full_like(ln_p, numpy.nan)
+    hi = numpy.full_like(ln_p, numpy.nan)
+    with numpy.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        for start, end in zip(seg_lo, seg_hi):
+            if numpy.isfinite(end):
+                reaches = residual(numpy.log(end)) >= 0
+            else:
+                reaches = numpy.inf - ln_k - ln_p >= 0
+            take = numpy.isnan(lo) & reaches
+            lo[take] = start
+            hi[take] = end
+
+        if numpy.isnan(lo).any():
+            raise CalculationError(
+                "Root finding for the virial loading failed, the pressure "
+                "may be outside the range the model can reach.")
+
+        # bracket the root in ln(n), extending open ends as needed
+        ln_henry = ln_k + ln_p
+        ln_lo = numpy.where(lo > 0, numpy.log(lo), numpy.minimum(ln_henry, numpy.log(hi)))
+        ln_hi = numpy.where(numpy.isfinite(hi), numpy.log(hi), numpy.maximum(ln_henry, ln_lo))
+        for _ in range(maxiter):
+            below = (lo == 0) & (residual(ln_lo) >= 0)
+            above = ~numpy.isfinite(hi) & (residual(ln_hi) < 0)
+            if not (below.any() or above.any()):
+                break
+            ln_lo[below] -= 1
+            ln_hi[above] += 1
+
+        ln_n = numpy.clip(ln_henry, ln_lo, ln_hi)
+        for _ in range(maxiter):
+            n = numpy.exp(ln_n)
+            res = ln_n - ln_k + n * (A + n * (B + n * C)) - ln_p
+            ln_lo = numpy.where(res < 0, ln_n, ln_lo)
+            ln_hi = numpy.where(res > 0, ln_n, ln_hi)
+
+            new = ln_n - res / (1 + n * (A + n * (2 * B + n * 3 * C)))
+            outside = ~((new > ln_lo) & (new < ln_hi))
+            new[outside] = (ln_lo[outside] + ln_hi[outside]) / 2
+
+            step = numpy.abs(new - ln_n)
+            ln_n = new
+            if numpy.max(step) < tol:
+                return numpy.exp(ln_n)
+
+    raise CalculationError(
+        "Root finding for the virial loading failed to converge "
+        "in {0} iterations.".format(maxiter))
+
+
+def _virial_inverse_kernel(ln_p, ln_k, A, B, C, seg_lo, seg_hi, tol, maxiter):
+    """Scalar version of the virial inversion, meant to be compiled."""
+    loading = numpy.empty_like(ln_p)
+    converged = True
+
+    for i in range(ln_p.shape[0]):
+        loading[i] = math.nan
+
+        # select the first increasing interval which reaches the pressure
+        lo = -1.0
+        hi = 0.0
+        for j in range(seg_lo.shape[0]):
+            end = seg_hi[j]
+            if math.isinf(end):
+                reaches = math.inf - ln_k - ln_p[i] >= 0
+            else:
+                reaches = math.log(end) - ln_k + end * (A + end * (B + end * C)) - ln_p[i] >= 0
+            if reaches:
+                lo = seg_lo[j]
+                hi = end
+                break
+        if lo < 0:
+            converged = False
+            continue
+
+        # bracket the root in ln(n), extending open ends as needed
+        ln_henry = ln_k + ln_p[i]
+        if lo > 0:
+            ln_lo = math.log(lo)
+        else:
+            ln_lo = min(ln_henry, math.log(hi))
+            for _ in range(maxiter):
+                n = math.exp(ln_lo)
+                if ln_lo - ln_k + n * (A + n * (B + n * C)) - ln_p[i] < 0:
+                    break
+                ln_lo -= 1
+        if math.isinf(hi):
+            ln_hi = max(ln_henry, ln_lo)
+            for _ in range(maxiter):
+                n = math.exp(ln_hi)
+                if ln_hi - ln_k + n * (A + n * (B + n * C)) - ln_p[i] >= 0:
+                    break
+                ln_hi += 1
+        else:
+            ln_hi = math.log(hi)
+
+        ln_n = min(max(ln_henry, ln_lo), ln_hi)
+        for _ in range(maxiter):
+            n = math.exp(ln_n)
+            res = ln_n - ln_k + n * (A + n * (B + n * C)) - ln_p[i]
+            if res < 0:
+                ln_lo = ln_n
+            elif res > 0:
+                ln_hi = ln_n
+
+            new = ln_n - res / (1 + n * (A + n * (2 * B + n * 3 * C)))
+            if not (ln_lo < new < ln_hi):
+                new = (ln_lo + ln_hi) / 2
+
+            step = abs(new - ln_n)
+            ln_n = new
+            if step < tol:
+                loading[i] = math.exp(ln_n)
+                break
+        else:
+            converged = False
+
+    return loading, converged
@@ -14,6 +14,11 @@ from ..utilities.unit_converter import _MOLAR_UNITS
 from ..utilities.unit_converter import _PRESSURE_UNITS
 from ..utilities.unit_converter import _VOLUME_UNITS
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def isotherm_to_jsonf(isotherm, path):
     """
@@ -108,7 +113,7 @@ def isotherm_from_jsonf(path, fmt=None,
     Isotherm
         The isotherm contained in the json file.
     """
-    with open(path) as file:
+    with open(path, mode='rb') as file:
         return isotherm_from_json(
             file.read(), fmt=fmt,
             loading_key=loading_key, pressure_key=pressure_key,
@@ -125,8 +130,8 @@ def isotherm_from_json(json_isotherm, fmt=None,
 
     Parameters
     ----------
-    json_isotherm : str
-        The isotherm in a json format, as a string.
+    json_isotherm : str or bytes
+        The isotherm in a json format, as a string or UTF-8 encoded bytes.
     loading_key : str
         The title of the pressure data in the json provided.
     pressure_key
@@ -147,7 +152,7 @@ def isotherm_from_json(json_isotherm, fmt=None,
 
     """
     # Parse isotherm in dictionary
-    raw_dict = json.loads(json_isotherm)
+    raw_dict = _json_loads(json_isotherm)
 
     data = raw_dict.pop("isotherm_data", None)
     model = raw_dict.pop("isotherm_model", None)
@@ -291,3 +296,20 @@ def _from_data_nist(raw_data):
         point.pop('species_data')
 
     return raw_data
+
+
+def _json_loads(json_isotherm):
+    """Parse a json string, using the faster orjson if it is available."""
+    if orjson is not None:
+        try:
+            return orjson.loads(json_isotherm)
+        except ValueError:
+            # orjson is strict and will not read NaN/Infinity, which
+            # the standard library parser (and writer) accepts
+            pass
+
+    # json.loads only accepts bytes from python 3.6
+    if isinstance(json_isotherm, bytes):
+        json_isotherm = json_isotherm.decode('utf-8')
+
+    return json.loads(json_isotherm)
@@ -87,8 +87,7 @@ def bspline(xs, ys, n=100, degree=2, periodic=False):
     # Calculate query range
     rng = numpy.linspace(periodic, (count-degree), n)
 
-    # Calculate result
-    res = numpy.array(interp.splev(rng, (kv, cv.T, degree))).T
+    # Calculate result, evaluating both coordinates in one pass
+    res_x, res_y = interp.splev(rng, (kv, cv.T, degree))
 
-    return (numpy.array([x[0] for x in res]),
-            numpy.array([y[1] for y in res]))
+    return res_x, res_y
@@ -0,0 +1,42 @@
+"""Utilities for optional just-in-time compilation with numba."""
+
+import importlib
+
+_COMPILED = {}  # We will keep compiled functions here
+
+
+def numba_jit(func, **options):
+    """
+    Return a numba-compiled version of a function, if numba is available.
+
+    Numba is an optional dependency. It is only imported when a
+    compiled function is first requested, and compiled functions
+    are kept in memory for subsequent calls.
+
+    Parameters
+    ----------
+    func : callable
+        The pure python function to compile in nopython mode.
+    options :
+        Any options to be passed to ``numba.njit``.
+
+    Returns
+    -------
+    callable or None
+        The compiled function, or None if numba is not installed,
+        in which case the caller should use a NumPy fallback.
+    """
+    key = (func, tuple(sorted(options.items())))
+    if key in _COMPILED:
+        return _COMPILED[key]
+
+    try:
+        numba = importlib.import_module('numba')
+    except ImportError:
+        compiled = None
+    else:
+        compiled = numba.njit(**options)(func)
+
+    _COMPILED[key] = compiled
+
+    return compiled
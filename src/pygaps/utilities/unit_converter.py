@@ -340,15 +340,14 @@ def c_unit(unit_list, value, unit_from, unit_to, sign=1):
     ``ParameterError``
         If the unit selected is not an option.
     """
-    if unit_to not in unit_list or unit_from not in unit_list:
+    try:
+        factor = unit_list[unit_from] / unit_list[unit_to]
+    except KeyError:
         raise ParameterError(
             "Units selected for conversion (from {} to {}) are not an option. Viable"
             " units are {}".format(unit_from, unit_to, unit_list.keys()))
 
-    value = value * \
-        (unit_list[unit_from] / unit_list[unit_to]) ** sign
-
-    return value
+    return value * factor ** sign
 
 
 def find_basis(unit):
@@ -103,7 +103,7 @@ DATA = {
         'Khi_slope': 700000,
         'Khi_virial': 1350000,
         'psd_micro_pore_size': 0.7,
-        'psd_dft_pore_size': 0.6,
+        'psd_dft_pore_size': 0.55,
     },
 
 }
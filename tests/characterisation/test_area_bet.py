@@ -14,11 +14,13 @@ All pre-calculated data for characterisation can be found in the
 
 import os
 
+import numpy
 import pytest
 from matplotlib.testing.decorators import cleanup
 from numpy import isclose
 
 import pygaps
+import pygaps.characterisation.area_bet as ab
 
 from .conftest import DATA
 from .conftest import DATA_N77_PATH
@@ -62,6 +64,60 @@ class TestAreaBET():
         assert isclose(bet_area, sample['s_bet_area'],
                        err_relative, err_absolute)
 
+    def test_area_BET_no_conversion(self):
+        """Test the isotherm is not modified by the calculation."""
+
+        sample = DATA['MCM-41']
+        filepath = os.path.join(DATA_N77_PATH, sample['file'])
+        isotherm = pygaps.isotherm_from_jsonf(filepath)
+        bet_area = pygaps.area_BET(isotherm).get("area")
+
+        isotherm.convert_pressure(mode_to='absolute', unit_to='bar')
+        pressure = isotherm.pressure()
+
+        assert isclose(pygaps.area_BET(isotherm).get("area"), bet_area)
+        assert isotherm.pressure_mode == 'absolute'
+        assert (isotherm.pressure() == pressure).all()
+
+    @pytest.mark.parametrize('sample', [sample for sample in DATA])
+    def test_bet_window_fit(self, sample):
+        """Test the BET kernel, run as python, against the NumPy fit."""
+        sample = DATA[sample]
+        filepath = os.path.join(DATA_N77_PATH, sample['file'])
+        isotherm = pygaps.isotherm_from_jsonf(filepath)
+
+        pressure = isotherm.pressure(branch='ads')
+        loading = isotherm.loading(branch='ads', loading_unit='mol', loading_basis='molar')
+        roq_t_array = loading * (1 - pressure)
+        minimum, maximum = ab._find_window_auto(pressure, roq_t_array)
+
+        kernel_fit = ab._bet_window_fit(pressure, loading, minimum, maximum)
+        numpy_fit = ab.bet_optimisation(
+            pressure[minimum:maximum],
+            pressure[minimum:maximum] / roq_t_array[minimum:maximum])
+
+        assert numpy.allclose(kernel_fit, numpy_fit, rtol=1e-10)
+
+    @pytest.mark.parametrize('compiled', [True, False])
+    def test_area_BET_zero_loading(self, compiled, monkeypatch):
+        """Test a zero loading in the BET window gives NaN, not an error."""
+        if compiled:
+            pytest.importorskip('numba')
+        else:
+            monkeypatch.setattr(ab, 'numba_jit', lambda func, **options: None)
+
+        sample = DATA['MCM-41']
+        filepath = os.path.join(DATA_N77_PATH, sample['file'])
+        isotherm = pygaps.isotherm_from_jsonf(filepath)
+        pressure = isotherm.pressure(branch='ads')
+        loading = isotherm.loading(branch='ads', loading_unit='mol', loading_basis='molar')
+        loading[numpy.searchsorted(pressure, 0.2)] = 0
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            result = ab.area_BET_raw(pressure, loading, 0.162, limits=(0, 0.35))
+
+        assert numpy.isnan(result[0])
+
     @cleanup
     def test_area_BET_output(self):
         """Test verbosity."""
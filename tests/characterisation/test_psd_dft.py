@@ -17,9 +17,10 @@ All pre-calculated data for characterisation can be found in the
 
 import os
 
+import matplotlib
+import matplotlib.pyplot as plt
 import numpy as np
 import pytest
-from matplotlib.testing.decorators import cleanup
 
 import pygaps
 import pygaps.characterisation.psd_dft as pdft
@@ -27,11 +28,42 @@ import pygaps.characterisation.psd_dft as pdft
 from .conftest import DATA
 from .conftest import DATA_N77_PATH
 
+# Graphs are only drawn, never shown
+matplotlib.use('Agg')
+
+
+# Only the samples which have a reference DFT pore size
+DFT_SAMPLES = [sample for sample in DATA if DATA[sample].get('psd_dft_pore_size')]
+
+
+@pytest.fixture(scope='session')
+def isotherm_cache():
+    """Keep isotherms read from file, to be shared between tests."""
+    return {}
+
+
+@pytest.fixture(scope='module')
+def loaded_kernel():
+    """Read the default kernel once, before any fitting is timed."""
+    return pdft._load_kernel(pdft._KERNELS['DFT-N2-77K-carbon-slit'])
+
+
+def load_isotherm(isotherm_cache, file):
+    """Read an isotherm from the test data, only parsing it once."""
+    if file not in isotherm_cache:
+        filepath = os.path.join(DATA_N77_PATH, file)
+        isotherm_cache[file] = pygaps.isotherm_from_jsonf(filepath)
+    return isotherm_cache[file]
+
 
 @pytest.mark.characterisation
 class TestPSDDFT():
     """Test pore size distribution calculation."""
 
+    def teardown_method(self):
+        """Close any figures left open by verbose tests."""
+        plt.close('all')
+
     def test_psd_dft_checks(self, basic_pointisotherm):
         """Checks for built-in safeguards."""
         # Will raise a "no kernel exception"
@@ -45,33 +77,28 @@ class TestPSDDFT():
     @pytest.mark.parametrize('kernel', [
         'DFT-N2-77K-carbon-slit',
     ])
-    @pytest.mark.parametrize('sample', [sample for sample in DATA])
-    def test_psd_dft(self, sample, kernel):
+    @pytest.mark.parametrize('sample', DFT_SAMPLES, ids=DFT_SAMPLES)
+    @pytest.mark.usefixtures('loaded_kernel')
+    def test_psd_dft(self, sample, kernel, isotherm_cache):
         """Test psd calculation with several model isotherms"""
         sample = DATA[sample]
-        # exclude datasets where it is not applicable
-        if sample.get('psd_dft_pore_volume', None):
-
-            filepath = os.path.join(DATA_N77_PATH, sample['file'])
-            isotherm = pygaps.isotherm_from_jsonf(filepath)
+        isotherm = load_isotherm(isotherm_cache, sample['file'])
 
-            result_dict = pdft.psd_dft(isotherm, kernel=kernel)
+        result_dict = pdft.psd_dft(isotherm, kernel=kernel)
 
-            loc = np.where(result_dict['pore_distribution'] == max(result_dict['pore_distribution']))
-            principal_peak = result_dict['pore_widths'][loc]
+        loc = np.argmax(result_dict['pore_distribution'])
+        principal_peak = result_dict['pore_widths'][loc]
 
-            err_relative = 0.05  # 5 percent
-            err_absolute = 0.01  # 0.01
+        err_relative = 0.05  # 5 percent
+        err_absolute = 0.01  # 0.01
 
-            assert np.isclose(
-                principal_peak,
-                sample['psd_micro_pore_size'],
-                err_relative, err_absolute)
+        assert np.isclose(
+            principal_peak,
+            sample['psd_dft_pore_size'],
+            err_relative, err_absolute)
 
-    @cleanup
-    def test_psd_dft_verbose(self):
+    def test_psd_dft_verbose(self, isotherm_cache):
         """Test verbosity."""
         data = DATA['MCM-41']
-        filepath = os.path.join(DATA_N77_PATH, data['file'])
-        isotherm = pygaps.isotherm_from_jsonf(filepath)
+        isotherm = load_isotherm(isotherm_cache, data['file'])
         pygaps.psd_dft(isotherm, verbose=True)
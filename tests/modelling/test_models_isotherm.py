@@ -13,15 +13,32 @@ The pre-calculated outputs are found as files in the
 tests/calculations/isotherm_model_data/*.txt folder.
 """
 
+import os
+
 import numpy
 import pytest
 
+import pygaps
 import pygaps.modelling as models
+import pygaps.modelling.virial as virial
+from pygaps.utilities.exceptions import CalculationError
 from pygaps.utilities.exceptions import ParameterError
 
+from ..characterisation.conftest import DATA
+from ..characterisation.conftest import DATA_N77_PATH
 from .conftest import MODEL_DATA
 
 
+@pytest.fixture(params=['compiled', 'numpy'])
+def virial_solver(request, monkeypatch):
+    """Invert the virial model with the compiled kernel, or with NumPy."""
+    if request.param == 'compiled':
+        pytest.importorskip('numba')
+    else:
+        monkeypatch.setattr(virial, 'numba_jit', lambda func, **options: None)
+    return request.param
+
+
 @pytest.mark.modelling
 class TestIsothermModels():
     """Test the isotherm models."""
@@ -64,6 +81,112 @@ class TestIsothermModels():
             assert numpy.isclose(
                 model.loading(p), test_values['loading'][i], 0.001)
 
+    @pytest.mark.parametrize("container", [list, numpy.array])
+    def test_henry_array_input(self, container):
+        """Test the Henry model functions on a list or an array of points."""
+        model = models.get_isotherm_model('Henry')
+        model.params = MODEL_DATA['Henry']['test_parameters']
+        test_values = MODEL_DATA['Henry']['test_values']
+
+        for function, values in [
+                (model.loading, test_values['pressure']),
+                (model.pressure, test_values['loading']),
+                (model.spreading_pressure, test_values['pressure']),
+        ]:
+            result = function(container(values))
+            assert isinstance(result, numpy.ndarray)
+            assert numpy.array_equal(result, [function(value) for value in values])
+
+    @pytest.mark.usefixtures('virial_solver')
+    def test_virial_loading_fitted(self):
+        """Test the virial inversion on a fit where the pressure turns over."""
+        filepath = os.path.join(DATA_N77_PATH, DATA['Takeda 5A']['file'])
+        isotherm = pygaps.isotherm_from_jsonf(filepath)
+        model = pygaps.ModelIsotherm.from_pointisotherm(isotherm, model='Virial').model
+
+        pressure = isotherm.pressure(branch='ads')
+        loading = model.loading(pressure)
+
+        assert numpy.all(numpy.diff(loading) >= 0)
+        assert numpy.allclose(model.pressure(loading), pressure, rtol=1e-6)
+        assert numpy.isclose(model.loading(0.01), 9.654, 0.001)
+
+    @pytest.mark.usefixtures('virial_solver')
+    def test_virial_loading_root(self):
+        """Test the virial inversion where plain Newton iterations diverge."""
+        model = models.get_isotherm_model('Virial')
+        model.params = dict(K=157.20, A=-1.518, B=0.2349, C=0.02815)
+
+        loading = model.loading(0.00727895)
+
+        assert numpy.isclose(loading, 3.5745, 0.001)
+        assert numpy.isclose(model.pressure(loading), 0.00727895, 1e-6)
+
+    @pytest.mark.usefixtures('virial_solver')
+    def test_virial_loading_no_root(self):
+        """Test that an error is raised if the virial model has no root."""
+        model = models.get_isotherm_model('Virial')
+        model.params = dict(K=-157.20, A=-1.518, B=0.2349, C=0.02815)
+
+        with pytest.raises(CalculationError):
+            model.loading(0.00727895)
+
+    def test_virial_fit_unused_params(self):
+        """Test that options the virial fit does not use give a warning."""
+        model = models.get_isotherm_model('Virial')
+        test_values = MODEL_DATA['Virial']['test_values']
+
+        with pytest.warns(UserWarning, match='loss'):
+            model.fit(
+                numpy.array(test_values['pressure']),
+                numpy.array(test_values['loading']),
+                None,
+                optimization_params=dict(add_point=True, loss='soft_l1'),
+            )
+
+    def test_virial_fit_few_points(self):
+        """Test that the virial fit needs at least four distinct loadings."""
+        model = models.get_isotherm_model('Virial')
+
+        with pytest.raises(CalculationError):
+            model.fit(
+                numpy.array([0.1, 0.2]),
+                numpy.array([1.0, 2.0]),
+                None,
+                optimization_params=dict(add_point=True),
+            )
+
+    def test_virial_fit_cache(self):
+        """Test the loading terms cached between virial fits."""
+        test_values = MODEL_DATA['Virial']['test_values']
+        pressure = numpy.array(test_values['pressure'])
+        loading = numpy.array(test_values['loading'])
+
+        model = models.get_isotherm_model('Virial')
+        model.fit(pressure, loading, None, optimization_params=dict(add_point=True))
+        assert len(model._fit_cache) == 1
+        first = next(iter(model._fit_cache.values()))
+
+        # refitting on the same loading reuses the cached terms
+        model.fit(pressure * 2, loading, None, optimization_params=dict(add_point=True))
+        assert len(model._fit_cache) == 1
+        assert next(iter(model._fit_cache.values())) is first
+
+        cold = models.get_isotherm_model('Virial')
+        cold.fit(pressure * 2, loading, None, optimization_params=dict(add_point=True))
+        for param in cold.params:
+            assert numpy.isclose(model.params[param], cold.params[param], 1e-12)
+
+        # only the most recently used loadings are kept
+        for i in range(virial._FIT_CACHE_SIZE):
+            model.fit(pressure, loading * (1 + 0.01 * (i + 1)), None,
+                      optimization_params=dict(add_point=True))
+        assert len(model._fit_cache) == virial._FIT_CACHE_SIZE
+        assert all(entry is not first for entry in model._fit_cache.values())
+
+        model.clear_cache()
+        assert not model._fit_cache
+
     @pytest.mark.parametrize("m_name", [key for key in MODEL_DATA])
     def test_models_pressure(self, m_name):
         """Test each model's pressure function."""
@@ -25,6 +25,14 @@ class TestJson():
 
         assert basic_pointisotherm == new_isotherm
 
+    def test_pointisotherm_from_json_bytes(self, basic_pointisotherm):
+        """Test the parsing of a PointIsotherm from encoded json."""
+
+        test_isotherm_json = pygaps.isotherm_to_json(basic_pointisotherm)
+        new_isotherm = pygaps.isotherm_from_json(test_isotherm_json.encode('utf-8'))
+
+        assert basic_pointisotherm == new_isotherm
+
     def test_modelisotherm_to_json(self, basic_modelisotherm):
         """Test the parsing of an ModelIsotherm to json."""
 
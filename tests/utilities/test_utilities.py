@@ -29,3 +29,16 @@ def test_file_paths():
         path, extension='.tst')
 
     assert all([path in known_paths for path in paths])
+
+
+@pytest.mark.core
+def test_numba_jit():
+    import pygaps.utilities.numba_utilities as nb_utils
+
+    def square(x):
+        return x * x
+
+    compiled = nb_utils.numba_jit(square)
+    assert compiled is nb_utils.numba_jit(square)
+    if compiled is not None:
+        assert compiled(3.0) == square(3.0)